@@ -1,43 +1,73 @@
 import fitz  # PyMuPDF
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 A4_WIDTH, A4_HEIGHT = 595, 842  # A4 size in points
+PDF_EXTENSIONS = frozenset({".pdf"})
+BACKUP_DIR = "originals"  # untouched copies of the PDFs, kept next to them
 
 def normalize_pdf_to_a4(input_path, output_path):
-    doc = fitz.open(input_path)
+    doc = fitz.open(input_path, filetype="pdf")
     new_doc = fitz.open()
 
     for page in doc:
         # Create new A4-sized page
         new_page = new_doc.new_page(width=A4_WIDTH, height=A4_HEIGHT)
 
-        # Calculate scale matrix to fit original content into A4
-        scale_x = A4_WIDTH / page.rect.width
-        scale_y = A4_HEIGHT / page.rect.height
-        scale = min(scale_x, scale_y)
+        # show_pdf_page scales the source page to fit the A4 rect and centers
+        # it, so no per-page transformation matrix is needed
+        new_page.show_pdf_page(new_page.rect, doc, page.number, keep_proportion=True)
 
-        # Calculate offset to center the content
-        trans_x = (A4_WIDTH - page.rect.width * scale) / 2
-        trans_y = (A4_HEIGHT - page.rect.height * scale) / 2
+    # Save to a temporary file first: output_path is usually the input file
+    # itself, and a failed save must not leave it half-written
+    temp_path = output_path + ".tmp"
+    try:
+        # Drop unused objects and compress streams so the output stays small
+        new_doc.save(temp_path, garbage=4, deflate=True, deflate_images=True,
+                     deflate_fonts=True, clean=True)
+    except BaseException:
+        # Don't leave a partial .tmp behind; batch_normalize would never pick it up again
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        new_doc.close()
+        doc.close()
+    os.replace(temp_path, output_path)
 
-        # Create transformation matrix
-        scale_matrix = fitz.Matrix(scale, scale)
-        translate_matrix = fitz.Matrix(1, 0, 0, 1, trans_x, trans_y)
-        matrix = scale_matrix * translate_matrix
+def batch_normalize(folder):
+    with os.scandir(folder) as entries:
+        pdf_files = [
+            entry for entry in entries
+            if entry.is_file()
+            and os.path.splitext(entry.name)[1].lower() in PDF_EXTENSIONS
+        ]
+    if not pdf_files:
+        return
 
-        new_page.show_pdf_page(new_page.rect, doc, page.number, matrix)
+    # Back up every original before any worker overwrites it. An existing backup is
+    # kept, so a second run never replaces an original with an already normalized copy.
+    backup_dir = os.path.join(folder, BACKUP_DIR)
+    os.makedirs(backup_dir, exist_ok=True)
+    for entry in pdf_files:
+        backup_path = os.path.join(backup_dir, entry.name)
+        if not os.path.exists(backup_path):
+            shutil.copy2(entry.path, backup_path)
 
-    new_doc.save(output_path)
-    new_doc.close()
-    doc.close()
+    # Each PDF is independent, so spread them across processes
+    workers = min(os.cpu_count() or 1, len(pdf_files))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for entry in pdf_files:
+            input_path = entry.path
+            output_path = input_path  # the original is in BACKUP_DIR
+            futures[executor.submit(normalize_pdf_to_a4, input_path, output_path)] = entry.name
 
-def batch_normalize(folder):
-    for fname in os.listdir(folder):
-        if fname.lower().endswith(".pdf"):
-            input_path = os.path.join(folder, fname)
-            output_path = input_path  # overwrite safely if you’ve backed up
+        for future in as_completed(futures):
+            fname = futures[future]
             try:
-                normalize_pdf_to_a4(input_path, output_path)
+                future.result()
                 print(f"✅ Normalized: {fname}")
             except Exception as e:
                 print(f"❌ Failed: {fname} -> {e}")
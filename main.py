@@ -1,20 +1,36 @@
 import sys
 import os
-import csv
-import tempfile
 import random
+import pickle
+import time
+from contextlib import contextmanager
+import numpy as np
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
     QComboBox, QPushButton, QCheckBox, QSpacerItem, QSizePolicy,
     QScrollArea, QFrame, QFileDialog, QMessageBox, QLineEdit,
-    QDialog, QTextEdit)
-from PyQt6.QtGui import (QDesktopServices, QShortcut, QKeySequence)
-from PyQt6.QtCore import QUrl
-import fitz
+    QDialog, QTextEdit, QProgressDialog)
+from PyQt6.QtGui import (QDesktopServices, QShortcut, QKeySequence, QStandardItemModel, QStandardItem)
+from PyQt6.QtCore import (QUrl, Qt, QObject, QRunnable, QSignalBlocker, QThreadPool, QTimer, pyqtSignal)
 import atexit
 
 temporary_preview_files = []
 
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+A4_WIDTH, A4_HEIGHT = 595, 842  # A4 size in points
+PATCH_LOG_CACHE_SECONDS = 300  # re-read the patch logs at most this often
+PAPER_NAMES = ("9709 Paper 3", "9231 Paper 3", "9231 Paper 4")
+
+TOPIC_GROUPS_9231_P4 = {
+    "chi": ["Chi-square Test (contingency table)", "Chi-square Test (goodness of fit)"],
+    "crv": ["Continuous Random Variable"],
+    "pgf": ["Probability Generating Function"],
+    "twci": [
+        "t-Test (single sample)", "t-Test (pooled sample)", "t-Test (paired sample)",
+        "Confidence Interval", "Wilcoxon Test (signed-rank)", "Wilcoxon Test (rank-sum)"
+    ]
+}
+
 @atexit.register
 def cleanup_temp_files():
     for path in temporary_preview_files:
@@ -24,6 +40,111 @@ def cleanup_temp_files():
         except Exception as e:
             print(f"Failed to delete temp file {path}: {e}")
 
+def load_category_rows(csv_path):
+    """ Read (topic, index, marks) rows from Categories.csv, using a pickled copy when it is up to date """
+    import csv  # only needed on a cache miss
+
+    pickle_path = os.path.splitext(csv_path)[0] + ".pkl"
+    try:
+        if os.path.getmtime(pickle_path) >= os.path.getmtime(csv_path):
+            with open(pickle_path, "rb") as f:
+                return pickle.load(f)
+    except (OSError, EOFError, pickle.PickleError):
+        pass
+
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        body = list(reader)
+    topic_col = header.index("Topic")
+    index_col = header.index("Question Index")
+    marks_col = header.index("Marks")
+    # Convert the whole Marks column in one map() instead of an int() call per row tuple
+    rows = list(zip(
+        [row[topic_col] for row in body],
+        [row[index_col] for row in body],
+        map(int, [row[marks_col] for row in body]),
+    ))
+
+    try:
+        with open(pickle_path, "wb") as f:
+            pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        # Read-only install, e.g. inside the PyInstaller bundle
+        print(f"Failed to write category cache {pickle_path}: {e}")
+    return rows
+
+def build_paper_data(rows):
+    """ Build the question lookups used by the UI from (topic, index, marks) rows """
+    question_data = {}  # { topic: [(index, marks)] }
+    index_to_marks = {}  # question indices are unique within a paper
+    index_to_topic = {}
+    for topic, index, marks in rows:
+        question_data.setdefault(topic, []).append((index, marks))
+        index_to_marks[index] = marks
+        index_to_topic[index] = topic
+
+    # Combo box contents per topic, so refilling a row does not re-walk the (index, marks) list
+    indices_by_topic = {
+        topic: [index for index, _ in questions] for topic, questions in question_data.items()
+    }
+    # (topic, (index, marks)) pools by marks, built once instead of per random selection,
+    # for "complete the target exactly" picks
+    marks_bucket = {}
+    for topic, questions in question_data.items():
+        for q in questions:
+            marks_bucket.setdefault(q[1], []).append((topic, q))
+    # Marks as compact arrays (every mark fits in int8), in question_data order, for the
+    # vectorized 9231 selections
+    marks_by_topic = {
+        topic: np.array([marks for _, marks in questions], dtype=np.int8)
+        for topic, questions in question_data.items()
+    }
+    # marks_counts[topic_ids[t], m]: how many questions of topic t are worth m marks
+    topic_ids = {topic: i for i, topic in enumerate(question_data)}
+    max_marks = max((int(marks.max()) for marks in marks_by_topic.values()), default=0)
+    marks_counts = np.zeros((len(topic_ids), max_marks + 1), dtype=np.int64)
+    for topic, marks in marks_by_topic.items():
+        marks_counts[topic_ids[topic]] = np.bincount(marks, minlength=max_marks + 1)
+    return {
+        "question_data": question_data,
+        "sorted_topics": tuple(sorted(question_data)),
+        "indices_by_topic": indices_by_topic,
+        "index_to_marks": index_to_marks,
+        "index_to_topic": index_to_topic,
+        "marks_bucket": marks_bucket,
+        "marks_by_topic": marks_by_topic,
+        "topic_ids": topic_ids,
+        "marks_counts": marks_counts,
+    }
+
+def paper_csv_path(paper_name):
+    folder = paper_name.replace(" ", "_")  # e.g., "Paper 3" → "Paper_3"
+    return os.path.join(MODULE_DIR, folder, "Categories.csv")
+
+def merge_cache_key(pdf_paths, show_indices):
+    """ Identify a merged paper by its sources and their modification times, or None if one is missing """
+    try:
+        return (tuple(pdf_paths), show_indices, tuple(os.path.getmtime(p) for p in pdf_paths))
+    except OSError:
+        return None
+
+def read_file_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def load_patch_logs(patch_dir):
+    """ Return the patch log file names, newest first, and the text of each one """
+    with os.scandir(patch_dir) as it:
+        entries = sorted([
+            e.name for e in it if e.is_file() and e.name.endswith(".txt")
+        ], reverse=True)
+    contents = {}
+    for name in entries:
+        with open(os.path.join(patch_dir, name), "r", encoding="utf-8") as f:
+            contents[name] = f.read()
+    return {"entries": entries, "contents": contents}
+
 def get_resource_path(relative_path):
     """ Get absolute path to resource, works for dev and PyInstaller """
     if hasattr(sys, '_MEIPASS'):
@@ -31,6 +152,129 @@ def get_resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 
+def generate_merged_pdf(pdf_paths, output_path, questions, show_indices, fast=False):
+    """ Merge the question PDFs into one paper, labelling every page with its question number.
+
+    fast skips the duplicate-object search and content-stream cleanup when saving, for
+    throwaway previews where a slightly larger file is worth the shorter wait.
+    """
+    import fitz  # PyMuPDF is large; load it on the first Preview/Save rather than at startup
+    from concurrent.futures import ThreadPoolExecutor  # pulls in logging; only needed here
+
+    doc = fitz.open()
+
+    # Read all source files concurrently. PyMuPDF itself is not thread-safe,
+    # so the documents are still opened from memory on the calling thread.
+    # A question picked in several rows is read and opened once, then inserted each time.
+    unique_paths = list(dict.fromkeys(pdf_paths))
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(unique_paths)))) as executor:
+        pdf_bytes = dict(zip(unique_paths, executor.map(read_file_bytes, unique_paths)))
+    sources = {}  # { path: (document, every page is A4) }
+
+    for i, (path, (index, _)) in enumerate(zip(pdf_paths, questions), start=1):
+        label = f"Question {i}"
+        if show_indices:
+            label += f": {index}"
+
+        if path not in sources:
+            src = fitz.open(stream=pdf_bytes.pop(path), filetype="pdf")
+            sources[path] = (src, all(
+                abs(page.rect.width - A4_WIDTH) < 1 and abs(page.rect.height - A4_HEIGHT) < 1 for page in src))
+        src, is_a4 = sources[path]
+        start = doc.page_count
+
+        if is_a4:
+            # Already A4 (normalized papers): copy the pages as they are. Question
+            # crops carry no useful links, so skip PyMuPDF's per-page link rewriting.
+            doc.insert_pdf(src, links=False)
+        else:
+            for page_num in range(len(src)):
+                new_page = doc.new_page(width=A4_WIDTH, height=A4_HEIGHT)
+                new_page.show_pdf_page(new_page.rect, src, pno=page_num)
+
+        for page_num in range(start, doc.page_count):
+            doc[page_num].insert_text(
+                (50, 50),
+                label,
+                fontsize=12,
+                fontname="Times-Roman",  # or "Courier"
+                color=(0, 0, 0)
+            )
+
+    for src, _ in sources.values():
+        src.close()
+
+    if fast:
+        doc.save(output_path, garbage=1, deflate=True)
+    else:
+        doc.save(output_path, garbage=3, deflate=True, clean=True)
+    doc.close()
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class PdfMergeWorker(QRunnable):
+    """ Runs generate_merged_pdf on the global thread pool; never touches widgets """
+    def __init__(self, pdf_paths, output_path, questions, show_indices, fast=False):
+        super().__init__()
+        self.pdf_paths = pdf_paths
+        self.output_path = output_path
+        self.questions = questions
+        self.show_indices = show_indices
+        self.fast = fast
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            generate_merged_pdf(self.pdf_paths, self.output_path, self.questions, self.show_indices,
+                                fast=self.fast)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(self.output_path)
+
+
+class PatchLogLoader(QRunnable):
+    """ Reads every patch log on the global thread pool """
+    def __init__(self, patch_dir):
+        super().__init__()
+        self.patch_dir = patch_dir
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            patch_logs = load_patch_logs(self.patch_dir)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(patch_logs)
+
+
+class PaperDataLoader(QRunnable):
+    """ Builds the data for every paper on the global thread pool so the first selection is instant """
+    def __init__(self, paper_names):
+        super().__init__()
+        self.paper_names = paper_names
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            papers = {}
+            for paper_name in self.paper_names:
+                try:
+                    rows = load_category_rows(paper_csv_path(paper_name))
+                except FileNotFoundError:
+                    continue  # reported when the paper is actually selected
+                papers[paper_name] = build_paper_data(rows)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(papers)
+
+
 class ExamMakerUI(QWidget):
     def __init__(self):
         super().__init__()
@@ -39,8 +283,28 @@ class ExamMakerUI(QWidget):
 
         self.layout = QVBoxLayout(self)
 
-        self.question_data = {}  # { topic: [{index, marks}] }
+        self._paper_cache = {}  # { paper_name: build_paper_data(...) }
+        self._rng = random.Random()  # private generator for the random_select_* retry loops
+        self._np_rng = np.random.default_rng()
+        self.set_paper_data(build_paper_data([]))
+        self._topic_model = self.build_topic_model()  # shared by every row's topic box
         self.question_rows = []
+        self._row_pool = []  # hidden rows kept for reuse, last removed on top
+        self._total_marks = 0  # running sum of row["marks"] over the visible rows
+        self._patch_log_cache = None  # load_patch_logs(...) result
+        self._patch_log_loaded_at = 0.0
+        self._patch_log_worker = None
+        self._merged_pdf_cache = {}  # { merge_cache_key(...): temporary preview file }
+        self._pdf_names = {}  # { paper folder: names of the question PDFs in it }
+
+        self._score_timer = QTimer(self)
+        self._score_timer.setSingleShot(True)
+        self._score_timer.setInterval(0)
+        self._score_timer.timeout.connect(self.refresh_total_score)
+        self._footer_timer = QTimer(self)
+        self._footer_timer.setSingleShot(True)
+        self._footer_timer.setInterval(0)
+        self._footer_timer.timeout.connect(self.refresh_footer_buttons_state)
 
         self.init_component_selector()
         self.init_question_area()
@@ -48,27 +312,54 @@ class ExamMakerUI(QWidget):
 
         QShortcut(QKeySequence(QKeySequence.StandardKey.Close), self, activated=self.close)
 
+        self._paper_loader = PaperDataLoader(PAPER_NAMES)
+        self._paper_loader.signals.finished.connect(self.on_papers_preloaded)
+        self._paper_loader.signals.error.connect(self.on_paper_preload_failed)
+        QThreadPool.globalInstance().start(self._paper_loader)
+
 
     def load_question_data(self, paper_name):
-        if paper_name not in ["9709 Paper 3", "9231 Paper 3", "9231 Paper 4"]:
-            self.question_data.clear()
+        if paper_name not in PAPER_NAMES:
+            self.set_paper_data(build_paper_data([]))
+            return
+
+        # Switching back to a paper that was already loaded needs no disk I/O
+        if paper_name in self._paper_cache:
+            self.set_paper_data(self._paper_cache[paper_name])
             return
 
-        folder = paper_name.replace(" ", "_")  # e.g., "Paper 3" → "Paper_3"
-        csv_path = os.path.join(os.path.dirname(__file__), folder, "Categories.csv")
-        if not os.path.exists(csv_path):
+        csv_path = paper_csv_path(paper_name)
+        try:
+            rows = load_category_rows(csv_path)
+        except FileNotFoundError:
             print(f"CSV not found for {paper_name}. Expected at: {csv_path}")
-            self.question_data.clear()
+            self.set_paper_data(build_paper_data([]))
             return
 
-        self.question_data.clear()
-        with open(csv_path, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                topic = row["Topic"]
-                index = row["Question Index"]
-                marks = int(row["Marks"])
-                self.question_data.setdefault(topic, []).append({"index": index, "marks": marks})
+        paper_data = build_paper_data(rows)
+        self._paper_cache[paper_name] = paper_data
+        self.set_paper_data(paper_data)
+
+    def on_papers_preloaded(self, papers):
+        self._paper_loader = None
+        for paper_name, paper_data in papers.items():
+            # Keep anything the user already loaded so the current rows stay on the same objects
+            self._paper_cache.setdefault(paper_name, paper_data)
+
+    def on_paper_preload_failed(self, message):
+        self._paper_loader = None
+        print(f"Failed to preload paper data: {message}")
+
+    def set_paper_data(self, paper_data):
+        self.question_data = paper_data["question_data"]
+        self._sorted_topics = paper_data["sorted_topics"]
+        self.indices_by_topic = paper_data["indices_by_topic"]
+        self.index_to_marks = paper_data["index_to_marks"]
+        self.index_to_topic = paper_data["index_to_topic"]
+        self.marks_bucket = paper_data["marks_bucket"]
+        self.marks_by_topic = paper_data["marks_by_topic"]
+        self.topic_ids = paper_data["topic_ids"]
+        self.marks_counts = paper_data["marks_counts"]
 
     def init_component_selector(self):
         top_layout = QHBoxLayout()
@@ -76,7 +367,7 @@ class ExamMakerUI(QWidget):
 
         self.component_box = QComboBox()
         self.component_box.setFixedWidth(180)  # Optional: Keep it compact
-        self.component_box.addItems(["(Select a Component)", "9709 Paper 3", "9231 Paper 3", "9231 Paper 4", "(Other Components Currently Unavailable)"])
+        self.component_box.addItems(["(Select a Component)", *PAPER_NAMES, "(Other Components Currently Unavailable)"])
         self.component_box.currentTextChanged.connect(self.on_component_selected)
         top_layout.addWidget(self.component_box)
 
@@ -131,6 +422,15 @@ class ExamMakerUI(QWidget):
         self.layout.addWidget(self.scroll_area)
 
     def add_question_row(self):
+        # Reuse a previously hidden row if there is one. Rows are only ever removed from
+        # the end, so the top of the pool is always the row for the next index.
+        if self._row_pool:
+            row = self._row_pool.pop()
+            self.question_rows.append(row)
+            self.reset_row_state(row)
+            row["container"].show()
+            return
+
         container = QFrame()
         row_layout = QHBoxLayout(container)
         row_layout.setContentsMargins(0, 0, 0, 0)
@@ -142,7 +442,7 @@ class ExamMakerUI(QWidget):
         row_layout.addWidget(question_label)
 
         topic_box = QComboBox()
-        topic_box.addItem("(Select Topic)")
+        topic_box.setModel(self._topic_model)
         topic_box.setFixedWidth(270)
         row_layout.addWidget(topic_box)
 
@@ -168,75 +468,108 @@ class ExamMakerUI(QWidget):
             "topic_box": topic_box,
             "question_box": question_box,
             "mark_label": mark_label,
+            "marks": 0,  # numeric copy of mark_label, counted in self._total_marks
             "preview_button": preview_button
         }
         self.question_rows.append(row)
 
-        topic_box.currentTextChanged.connect(lambda topic, idx=index - 1: self.update_question_list(idx))
-        question_box.currentTextChanged.connect(lambda index_text, idx=index - 1: self.update_mark_display(idx))
-        preview_button.clicked.connect(lambda _, idx=index - 1: self.preview_question(idx))
-
-        if self.question_data:
-            topics = sorted(self.question_data.keys())
-            topic_box.addItems(topics)
+        # One shared slot per signal; the slot finds its row from the sending widget
+        for widget in (topic_box, question_box, preview_button):
+            widget.setProperty("row_idx", index - 1)
+        topic_box.currentTextChanged.connect(self.on_topic_changed)
+        question_box.currentTextChanged.connect(self.on_question_changed)
+        preview_button.clicked.connect(self.on_preview_clicked)
 
         topic_box.setEnabled(True)
         question_box.setEnabled(False)
         preview_button.setEnabled(False)
 
 
+    def on_topic_changed(self, _topic):
+        self.update_question_list(self.sender().property("row_idx"))
+
+    def on_question_changed(self, _index_text):
+        self.update_mark_display(self.sender().property("row_idx"))
+
+    def on_preview_clicked(self):
+        self.preview_question(self.sender().property("row_idx"))
+
     def remove_last_question_row(self):
         if len(self.question_rows) > 1:
-            last = self.question_rows.pop()
-            last["container"].setParent(None)
+            self.hide_last_question_row()
             self.update_total_score()
 
+    def hide_last_question_row(self):
+        row = self.question_rows.pop()
+        self._total_marks -= row["marks"]
+        row["marks"] = 0
+        row["container"].hide()
+        self._row_pool.append(row)
+
+    def reset_row_state(self, row):
+        topic_box = row["topic_box"]
+        question_box = row["question_box"]
+        with QSignalBlocker(topic_box), QSignalBlocker(question_box):
+            if topic_box.model() is not self._topic_model:
+                topic_box.setModel(self._topic_model)
+            topic_box.setCurrentIndex(0)
+            question_box.clear()
+            question_box.addItem("(Select Question)")
+
+        self.set_row_marks(row)
+        topic_box.setEnabled(True)
+        question_box.setEnabled(False)
+        row["preview_button"].setEnabled(False)
+
     def on_component_selected(self, paper_name):
-        self.random_btn.setEnabled(paper_name in ["9709 Paper 3", "9231 Paper 3", "9231 Paper 4"])
+        self.random_btn.setEnabled(paper_name in PAPER_NAMES)
         self.load_question_data(paper_name)
-        topics = sorted(self.question_data.keys())
+        old_model = self._topic_model
+        self._topic_model = self.build_topic_model()
 
-        for row in self.question_rows:
+        # Point every row at the one shared model instead of clearing and refilling each combo box
+        for idx, row in enumerate(self.question_rows):
             row["topic_box"].setEnabled(True)
+            with QSignalBlocker(row["topic_box"]):
+                row["topic_box"].setModel(self._topic_model)
+            self.update_question_list(idx)
+        old_model.deleteLater()
 
-        for row in self.question_rows:
-            row["topic_box"].clear()
-            row["topic_box"].addItem("(Select Topic)")
-            row["topic_box"].addItems(topics)
-            row["question_box"].clear()
-            row["question_box"].addItem("(Select Question)")
-            row["mark_label"].setText("Marks: —")
+    def build_topic_model(self):
+        model = QStandardItemModel(self)
+        model.appendRow(QStandardItem("(Select Topic)"))
+        for topic in self._sorted_topics:
+            model.appendRow(QStandardItem(topic))
+        return model
 
 
     def update_question_list(self, idx):
         if idx >= len(self.question_rows):
             return
         row = self.question_rows[idx]
-        topic = row["topic_box"].currentText()
-        if topic in self.question_data:
-            row["question_box"].setEnabled(True)
-        else:
-            row["question_box"].setEnabled(False)
-
-        row["question_box"].clear()
-        row["question_box"].addItem("(Select Question)")
-        if topic in self.question_data:
-            for item in self.question_data[topic]:
-                row["question_box"].addItem(item["index"])
-        row["mark_label"].setText("Marks: —")
-        self.update_total_score()
+        self.fill_question_box(row, row["topic_box"].currentText())
+        self.set_row_marks(row)
+        self.update_mark_display(idx)
+
+    def fill_question_box(self, row, topic):
+        question_box = row["question_box"]
+        question_box.setEnabled(topic in self.question_data)
+
+        # Refill without firing currentTextChanged for every inserted item
+        with QSignalBlocker(question_box):
+            question_box.clear()
+            question_box.addItem("(Select Question)")
+            if topic in self.question_data:
+                question_box.addItems(self.indices_by_topic[topic])
 
     def update_mark_display(self, idx):
         if idx >= len(self.question_rows):
             return
         row = self.question_rows[idx]
-        topic = row["topic_box"].currentText()
         index = row["question_box"].currentText()
-        if topic in self.question_data:
-            for item in self.question_data[topic]:
-                if item["index"] == index:
-                    row["mark_label"].setText(f"Marks: {item['marks']}")
-                    break
+        marks = self.index_to_marks.get(index)
+        if marks is not None:
+            self.set_row_marks(row, marks)
         if index and index != "(Select Question)":
             row["preview_button"].setEnabled(True)
         else:
@@ -244,7 +577,17 @@ class ExamMakerUI(QWidget):
         self.update_footer_buttons_state()
         self.update_total_score()
 
+    # Row signals arrive in bursts (component switch, reset, random selection); both
+    # updates below are coalesced into one recompute on the next event-loop pass.
     def update_footer_buttons_state(self):
+        if not self._footer_timer.isActive():
+            self._footer_timer.start()
+
+    def update_total_score(self):
+        if not self._score_timer.isActive():
+            self._score_timer.start()
+
+    def refresh_footer_buttons_state(self):
         any_selected = any(
             row["question_box"].currentText() != "(Select Question)"
             for row in self.question_rows
@@ -254,16 +597,15 @@ class ExamMakerUI(QWidget):
         self.copy_btn.setEnabled(any_selected)
         self.sort_button.setEnabled(any_selected)
 
-    def update_total_score(self):
-        total = 0
-        for row in self.question_rows:
-            label = row["mark_label"].text()
-            if label.startswith("Marks: "):
-                try:
-                    total += int(label.replace("Marks: ", ""))
-                except ValueError:
-                    continue
-        self.total_score_label.setText(f"[Total Score: {total}]")
+    def refresh_total_score(self):
+        self.total_score_label.setText(f"[Total Score: {self._total_marks}]")
+
+    def set_row_marks(self, row, marks=None):
+        """ Show a row's marks, or a dash when no question is selected """
+        new_marks = marks or 0
+        self._total_marks += new_marks - row["marks"]
+        row["marks"] = new_marks
+        row["mark_label"].setText("Marks: —" if marks is None else f"Marks: {marks}")
 
     def preview_question(self, idx):
         if idx >= len(self.question_rows):
@@ -272,13 +614,33 @@ class ExamMakerUI(QWidget):
         index = row["question_box"].currentText()
         if index and index != "(Select Question)":
             folder = self.component_box.currentText().replace(" ", "_")
-            path = os.path.join(os.path.dirname(__file__), folder, index + ".pdf")
-            if os.path.exists(path):
-                QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+            if index + ".pdf" in self.question_pdf_names(folder):
+                QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.join(MODULE_DIR, folder, index + ".pdf")))
+
+    def question_pdf_names(self, folder):
+        """ PDF names in a paper folder, read once instead of a stat per question """
+        names = self._pdf_names.get(folder)
+        if names is None:
+            try:
+                with os.scandir(os.path.join(MODULE_DIR, folder)) as it:
+                    names = frozenset(e.name for e in it if e.name.endswith(".pdf"))
+            except OSError:
+                names = frozenset()
+            self._pdf_names[folder] = names
+        return names
+
+    def missing_question_pdfs(self, folder, questions):
+        """ Warn about selected questions without a PDF in the paper folder; True if there were any """
+        names = self.question_pdf_names(folder)
+        missing = [index for index, _ in questions if index + ".pdf" not in names]
+        if missing:
+            QMessageBox.warning(self, "Missing Questions",
+                                "No PDF found for:\n" + "\n".join(dict.fromkeys(missing)))
+        return bool(missing)
 
     def perform_random_selection(self):
         paper = self.component_box.currentText()
-        if paper not in ["9709 Paper 3", "9231 Paper 3", "9231 Paper 4"]:
+        if paper not in PAPER_NAMES:
             QMessageBox.warning(self, "Unavailable", "Random selection is only available for Paper 3 and 4.")
             return
 
@@ -298,93 +660,128 @@ class ExamMakerUI(QWidget):
             QMessageBox.warning(self, "Selection Failed", "Could not generate a valid combination.")
             return
 
-        self.reset_question_rows(expected_count)
+        # Every kept row is overwritten below, so only the row count needs adjusting
+        self.ensure_row_count(expected_count)
         for i, row in enumerate(self.question_rows):
             if i < len(selected):
-                topic, q = selected[i]
-                row["topic_box"].setEnabled(True)
-                row["question_box"].setEnabled(True)
-                row["preview_button"].setEnabled(True)
-                row["topic_box"].setCurrentText(topic)
-                self.update_question_list(i)
-                row["question_box"].setCurrentText(q["index"])
-                self.update_mark_display(i)
+                topic, (index, _) = selected[i]
+                self.apply_row_selection(i, topic, index)
             else:
-                row["topic_box"].setCurrentIndex(0)
-                row["question_box"].setCurrentIndex(0)
-                row["mark_label"].setText("Marks: —")
+                self.reset_row_state(row)
+        self.update_footer_buttons_state()
         self.update_total_score()
 
+    @contextmanager
+    def suppress_row_signals(self, row):
+        with QSignalBlocker(row["topic_box"]), QSignalBlocker(row["question_box"]):
+            yield
+
+    def apply_row_selection(self, idx, topic, index):
+        """ Select topic and question on a row, refreshing it once rather than once per signal """
+        row = self.question_rows[idx]
+        with self.suppress_row_signals(row):
+            row["topic_box"].setCurrentText(topic)
+            self.fill_question_box(row, topic)
+            row["question_box"].setCurrentText(index)
+        self.update_mark_display(idx)
+
     def random_select_9231_p4(self):
-        target = 50
-        groups = {
-            "chi": ["Chi-square Test (contingency table)", "Chi-square Test (goodness of fit)"],
-            "crv": ["Continuous Random Variable"],
-            "pgf": ["Probability Generating Function"],
-            "twci": [
-                "t-Test (single sample)", "t-Test (pooled sample)", "t-Test (paired sample)",
-                "Confidence Interval", "Wilcoxon Test (signed-rank)", "Wilcoxon Test (rank-sum)"
-            ]
-        }
+        """ Draw uniformly from every valid Paper 4 selection instead of retrying random guesses.
 
-        for _ in range(1000):
-            selected = []
-            used_topics = set()
-            below_6 = 0
-
-            def choose(topics):
-                pool = [(t, q) for t in topics for q in self.question_data.get(t, [])]
-                return random.choice(pool) if pool else None
-
-            for key in ["chi", "crv", "pgf"]:
-                pick = choose(groups[key])
-                if not pick:
-                    break
-                topic, q = pick
-                selected.append((topic, q))
-                used_topics.add(topic)
-                if q["marks"] < 6:
-                    below_6 += 1
-
-            pick4 = choose(groups["twci"])
-            if not pick4:
-                continue
-            topic4, q4 = pick4
-            selected.append((topic4, q4))
-            used_topics.add(topic4)
-            if q4["marks"] < 6:
-                below_6 += 1
-
-            current_total = sum(q["marks"] for _, q in selected)
-            if current_total > target - 10 or below_6 > 1:
-                continue
-
-            remaining_twci = [t for t in groups["twci"] if t not in used_topics]
-            fifth_candidates = [(t, q) for t in remaining_twci for q in self.question_data.get(t, []) if
-                                current_total + q["marks"] < target]
-            if not fifth_candidates:
-                continue
-            topic5, q5 = random.choice(fifth_candidates)
-            selected.append((topic5, q5))
-            used_topics.add(topic5)
-            current_total += q5["marks"]
-            if q5["marks"] < 6:
-                below_6 += 1
-            if below_6 > 1:
-                continue
-
-            final_candidates = [(t, q) for t in self.question_data if t not in used_topics for q in
-                                self.question_data[t] if current_total + q["marks"] == target]
-            if not final_candidates:
-                continue
-            topic6, q6 = random.choice(final_candidates)
-            selected.append((topic6, q6))
-
-            if len(selected) == 6 and sum(q["marks"] for _, q in selected) == target:
-                return selected  # ✅ return here
-        return None  # ❌ if all attempts fail
+        Questions are grouped into (topic, marks) classes. The number of valid papers each
+        combination of classes yields is counted in one vectorized pass, a combination is
+        drawn in proportion to that count, and then a question is drawn from each class.
+        """
+        target = 50
+        qd = self.question_data
+        if not qd:
+            return None
+
+        topics = list(qd)  # topic_ids follow question_data order
+        topic_ids = self.topic_ids
+        counts = self.marks_counts
+        max_marks = counts.shape[1] - 1
+
+        def classes(key):
+            """ (topic id, marks, question count) of every non-empty class in a topic group """
+            ids = np.array([topic_ids[t] for t in TOPIC_GROUPS_9231_P4[key] if t in topic_ids], dtype=np.intp)
+            rows, marks = np.nonzero(counts[ids])
+            return ids[rows], marks, counts[ids[rows], marks]
+
+        chi_t, chi_m, chi_c = classes("chi")
+        crv_t, crv_m, crv_c = classes("crv")
+        pgf_t, pgf_m, pgf_c = classes("pgf")
+        tw_t, tw_m, tw_c = classes("twci")
+
+        # Axis 0: (chi, crv, pgf) class triples; axis 1: ordered pairs of distinct twci topics
+        fa, fb, fc = (g.ravel() for g in np.meshgrid(
+            np.arange(len(chi_t)), np.arange(len(crv_t)), np.arange(len(pgf_t)), indexing="ij"))
+        p4, p5 = (g.ravel() for g in np.meshgrid(np.arange(len(tw_t)), np.arange(len(tw_t)), indexing="ij"))
+        distinct = tw_t[p4] != tw_t[p5]
+        p4, p5 = p4[distinct], p5[distinct]
+
+        front_marks = chi_m[fa] + crv_m[fb] + pgf_m[fc]
+        front_below = (chi_m[fa] < 6).astype(np.int64) + (crv_m[fb] < 6) + (pgf_m[fc] < 6)
+        head_total = front_marks[:, None] + tw_m[p4][None, :]
+        head_below = front_below[:, None] + (tw_m[p4] < 6)[None, :]
+        fifth_total = head_total + tw_m[p5][None, :]
+        fifth_below = head_below + (tw_m[p5] < 6)[None, :]
+        last_marks = target - fifth_total
+        # Same rules as the old retry loop: the first four leave room for two more questions,
+        # at most one of the first five is worth under 6 marks, and the sixth completes the target
+        valid = ((head_total <= target - 10) & (head_below <= 1) & (fifth_below <= 1) &
+                 (last_marks > 0) & (last_marks <= max_marks))
+        last_marks = np.where(valid, last_marks, 0)
+
+        # The sixth may come from any topic the first five did not use; those five are distinct
+        last_count = counts.sum(axis=0)[last_marks]
+        for used in (chi_t[fa][:, None], crv_t[fb][:, None], pgf_t[fc][:, None],
+                     tw_t[p4][None, :], tw_t[p5][None, :]):
+            last_count = last_count - counts[used, last_marks]
+        weights = np.where(
+            valid,
+            (chi_c[fa] * crv_c[fb] * pgf_c[fc])[:, None] * (tw_c[p4] * tw_c[p5])[None, :] * last_count,
+            0)
+
+        cell = self.draw_weighted_index(weights)
+        if cell is None:
+            return None
+        f, p = divmod(cell, len(p4))
+
+        selected = [
+            self.draw_question(topics[chi_t[fa[f]]], chi_m[fa[f]]),
+            self.draw_question(topics[crv_t[fb[f]]], crv_m[fb[f]]),
+            self.draw_question(topics[pgf_t[fc[f]]], pgf_m[fc[f]]),
+            self.draw_question(topics[tw_t[p4[p]]], tw_m[p4[p]]),
+            self.draw_question(topics[tw_t[p5[p]]], tw_m[p5[p]]),
+        ]
+        used_topics = {topic for topic, _ in selected}
+        last = target - sum(marks for _, (_, marks) in selected)
+        selected.append(self._rng.choice([(t, q) for t, q in self.marks_bucket[last]
+                                          if t not in used_topics]))
+        return selected
+
+    def draw_weighted_index(self, weights):
+        """ Index into the flattened weights, drawn in proportion to them; None if all are 0 """
+        total_weight = int(weights.sum())
+        if total_weight == 0:
+            return None
+        cumulative = np.cumsum(weights)
+        return int(np.searchsorted(cumulative, self._np_rng.integers(total_weight), side="right"))
+
+    def draw_question(self, topic, marks):
+        """ A uniformly drawn (topic, (index, marks)) among the topic's questions worth `marks` """
+        positions = np.flatnonzero(self.marks_by_topic[topic] == marks)
+        return topic, self.question_data[topic][int(self._np_rng.choice(positions))]
 
     def random_select_9231_p3(self):
+        """ Draw uniformly from every valid Paper 3 selection instead of retrying random guesses.
+
+        ways[k][t, b] counts the ways the first k core topics can total t marks with b of them
+        worth under 6 marks (at most one is allowed). The seventh question's marks are drawn
+        in proportion to how many papers each final total completes, and the core picks are
+        then traced back through the tables one topic at a time.
+        """
         target = 50
         core_topics = [
             "Projectile Motion", "Center of Mass", "Circular Motion",
@@ -392,40 +789,63 @@ class ExamMakerUI(QWidget):
         ]
         extra_pool = ["Equilibrium of Rigid Body", "Circular Motion"]
 
-        for _ in range(1000):
-            selected = []
-            used = set()
-            total = 0
-            below_6 = 0
+        # Every core topic needs a question, and the extra pool at least one in total
+        qd = self.question_data
+        if any(not qd.get(t) for t in core_topics) or not any(qd.get(t) for t in extra_pool):
+            return None
+
+        counts = self.marks_counts
+        max_marks = counts.shape[1] - 1
+        low = np.arange(max_marks + 1) < 6  # marks values that count as "under 6"
+
+        ways = [np.zeros((target + 1, 2), dtype=np.int64)]
+        ways[0][0, 0] = 1
+        for topic in core_topics:
+            topic_counts = counts[self.topic_ids[topic]]
+            prev = ways[-1]
+            cur = np.zeros_like(prev)
+            for m in np.flatnonzero(topic_counts[:target + 1]):
+                shifted = prev[:target + 1 - m] * topic_counts[m]
+                if low[m]:
+                    cur[m:, 1] += shifted[:, 0]
+                else:
+                    cur[m:] += shifted
+            ways.append(cur)
+
+        # Same rules as the old retry loop: the core totals at most 44, the seventh comes from
+        # the extra pool and completes the target, and at most one of the seven is under 6 marks
+        extra_counts = sum(counts[self.topic_ids[t]] for t in extra_pool if t in self.topic_ids)
+        core_totals = np.arange(target + 1)
+        needed = target - core_totals
+        fits = (core_totals <= 44) & (needed <= max_marks)
+        needed = np.where(fits, needed, 0)
+        weights = ways[-1] * np.where(fits, extra_counts[needed], 0)[:, None]
+        weights[low[needed], 1] = 0
+
+        cell = self.draw_weighted_index(weights)
+        if cell is None:
+            return None
+        total, below = divmod(cell, 2)
+        last = target - total
+        last_pick = self._rng.choice([(t, q) for t, q in self.marks_bucket[last] if t in extra_pool])
 
-            for topic in core_topics:
-                questions = self.question_data.get(topic, [])
-                if not questions:
-                    break
-                q = random.choice(questions)
-                selected.append((topic, q))
-                used.add(topic)
-                total += q["marks"]
-                if q["marks"] < 6:
-                    below_6 += 1
-
-            if len(selected) < 6 or total > 44:
-                continue
-
-            candidates = []
-            for topic in extra_pool:
-                for q in self.question_data.get(topic, []):
-                    if total + q["marks"] == target:
-                        new_below_6 = below_6 + (1 if q["marks"] < 6 else 0)
-                        if new_below_6 <= 1:
-                            candidates.append((topic, q))
-
-            if not candidates:
-                continue
-
-            selected.append(random.choice(candidates))
-            return selected
-        return None
+        selected = []
+        for k in range(len(core_topics), 0, -1):
+            topic = core_topics[k - 1]
+            topic_counts = counts[self.topic_ids[topic]]
+            marks = np.flatnonzero(topic_counts[:total + 1])
+            prev_below = below - low[marks]
+            options = np.where(
+                prev_below >= 0,
+                ways[k - 1][total - marks, np.maximum(prev_below, 0)] * topic_counts[marks],
+                0)
+            m = int(marks[self.draw_weighted_index(options)])
+            selected.append(self.draw_question(topic, m))
+            total -= m
+            below -= int(low[m])
+        selected.reverse()
+        selected.append(last_pick)
+        return selected
 
     def random_select_9709_p3(self):
         target = 75
@@ -441,57 +861,66 @@ class ExamMakerUI(QWidget):
         ]
         filler_pool = ["Auxiliary Angle Method", "Complex Numbers", "Product Rule and Quotient Rule"]
 
+        # Give up at once unless every must-have topic and every one-of group has a question
+        qd = self.question_data
+        if any(not qd.get(t) for t in must_have_once + must_have_at_least):
+            return None
+        if any(not any(qd.get(t) for t in group) for group in one_of_sets):
+            return None
+
+        # Bind each topic's question list and bit (from topic_ids) once; the used topics of an
+        # attempt are a bitmask, so membership tests are a single AND
+        def bind(topics):
+            return [(t, 1 << self.topic_ids[t], qd[t]) for t in topics if qd.get(t)]
+
+        must_have_bound = bind(must_have_once)
+        at_least_bound = bind(must_have_at_least)
+        one_of_bound = [bind(group) for group in one_of_sets]
+        filler_bound = bind(filler_pool)
+
         for _ in range(1000):
             selected = []
-            used_topics = set()
+            used_mask = 0
             total = 0
 
-            def pick_unique(topic_list):
-                topic = random.choice(topic_list)
-                questions = [q for q in self.question_data.get(topic, []) if topic not in used_topics]
-                return (topic, random.choice(questions)) if questions else None
-
             # Add required topics
-            for topic in must_have_once:
-                q_list = self.question_data.get(topic, [])
-                if not q_list:
-                    break
-                q = random.choice(q_list)
+            for topic, bit, q_list in must_have_bound:
+                q = self._rng.choice(q_list)
                 selected.append((topic, q))
-                used_topics.add(topic)
-                total += q["marks"]
+                used_mask |= bit
+                total += q[1]
 
             # Add "at least once" topic
-            q_list = self.question_data.get("Complex Numbers", [])
-            if q_list and "Complex Numbers" not in used_topics:
-                q = random.choice(q_list)
-                selected.append(("Complex Numbers", q))
-                used_topics.add("Complex Numbers")
-                total += q["marks"]
-
-            # Add one from each option group
-            for group in one_of_sets:
-                pick = pick_unique(group)
-                if pick:
-                    topic, q = pick
+            for topic, bit, q_list in at_least_bound:
+                if used_mask & bit:
+                    continue
+                q = self._rng.choice(q_list)
+                selected.append((topic, q))
+                used_mask |= bit
+                total += q[1]
+
+            # Add one from each option group, from a topic not used yet
+            for group in one_of_bound:
+                available = [entry for entry in group if not used_mask & entry[1]]
+                if available:
+                    topic, bit, q_list = self._rng.choice(available)
+                    q = self._rng.choice(q_list)
                     selected.append((topic, q))
-                    used_topics.add(topic)
-                    total += q["marks"]
-
-            # Fill up remaining slots
-            fillers = [t for t in filler_pool if t not in used_topics]
-            for topic in fillers:
-                for q in self.question_data.get(topic, []):
-                    if topic in used_topics:
-                        continue
-                    if len(selected) >= 11:
-                        break
-                    if total + q["marks"] <= target:
+                    used_mask |= bit
+                    total += q[1]
+
+            # Fill up remaining slots with the first question of each unused topic that fits
+            for topic, bit, q_list in filler_bound:
+                if used_mask & bit or len(selected) >= 11:
+                    continue
+                for q in q_list:
+                    if total + q[1] <= target:
                         selected.append((topic, q))
-                        used_topics.add(topic)
-                        total += q["marks"]
-                    if total == target and 10 <= len(selected) <= 11:
-                        return selected
+                        used_mask |= bit
+                        total += q[1]
+                        break
+                if total == target and 10 <= len(selected) <= 11:
+                    return selected
 
             if total == target and 10 <= len(selected) <= 11:
                 return selected
@@ -561,65 +990,56 @@ class ExamMakerUI(QWidget):
 
     def reset_all(self):
         self.component_box.setCurrentIndex(0)
-        for row in self.question_rows:
-            row["container"].setParent(None)
-        self.question_rows.clear()
-        for _ in range(6):
-            self.add_question_row()
+        self.reset_question_rows(6)
         self.show_index_checkbox.setChecked(False)
         self.total_score_label.setText("[Total Score: 0]")
         self.preview_btn.setEnabled(False)
         self.save_btn.setEnabled(False)
         self.copy_btn.setEnabled(False)
-        for row in self.question_rows:
-            row["topic_box"].setEnabled(True)
-            row["question_box"].setEnabled(False)
-            row["preview_button"].setEnabled(False)
 
     def sort_questions_by_marks(self):
         selected = []
         for row in self.question_rows:
-            topic = row["topic_box"].currentText()
             index = row["question_box"].currentText()
-            if topic in self.question_data and index != "(Select Question)":
-                for item in self.question_data[topic]:
-                    if item["index"] == index:
-                        selected.append((topic, index, item["marks"]))
-                        break
+            marks = self.index_to_marks.get(index)
+            if marks is not None:
+                selected.append((self.index_to_topic[index], index, marks))
 
         selected.sort(key=lambda x: x[2])
 
         for i, row in enumerate(self.question_rows):
             if i < len(selected):
-                topic, index, marks = selected[i]
-                row["topic_box"].setCurrentText(topic)
-                self.update_question_list(i)
-                row["question_box"].setCurrentText(index)
-                row["mark_label"].setText(f"Marks: {marks}")
+                topic, index, _ = selected[i]
+                self.apply_row_selection(i, topic, index)
             else:
-                row["topic_box"].setCurrentIndex(0)
-                row["question_box"].setCurrentIndex(0)
-                row["mark_label"].setText("Marks: —")
+                self.reset_row_state(row)
 
+        self.update_footer_buttons_state()
         self.update_total_score()
 
     def collect_selected_questions(self):
         questions = []
         for row in self.question_rows:
-            topic = row["topic_box"].currentText()
             index = row["question_box"].currentText()
-            if topic in self.question_data and index != "(Select Question)":
-                for item in self.question_data[topic]:
-                    if item["index"] == index:
-                        questions.append({"index": index, "marks": item["marks"]})
-                        break
+            marks = self.index_to_marks.get(index)
+            if marks is not None:
+                questions.append((index, marks))
         return questions
 
+    def ensure_row_count(self, count):
+        """ Hide or add rows until exactly `count` are shown; rows that stay keep their selections """
+        while len(self.question_rows) > count:
+            self.hide_last_question_row()
+        while len(self.question_rows) < count:
+            self.add_question_row()
+
     def reset_question_rows(self, count=6):
+        # Hide or add only the difference and clear the rest, rather than rebuilding every widget
+        while len(self.question_rows) > count:
+            self.hide_last_question_row()
         for row in self.question_rows:
-            row["container"].setParent(None)
-        self.question_rows.clear()
-        for _ in range(count):
+            self.reset_row_state(row)
+        while len(self.question_rows) < count:
             self.add_question_row()
 
     def preview_paper(self):
@@ -629,19 +1049,23 @@ class ExamMakerUI(QWidget):
             return
 
         folder = self.component_box.currentText().replace(" ", "_")
-        base_path = os.path.dirname(__file__)
-        pdf_paths = [os.path.join(base_path, folder, q["index"] + ".pdf") for q in questions]
+        if self.missing_question_pdfs(folder, questions):
+            return
+        pdf_paths = [os.path.join(MODULE_DIR, folder, index + ".pdf") for index, _ in questions]
+
+        # The same selection was previewed before and no source has changed since
+        cached_path = self.cached_merged_pdf(pdf_paths)
+        if cached_path:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(cached_path))
+            return
 
+        import tempfile
         with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
             output_path = temp_pdf.name
             # Add to cleanup list
             temporary_preview_files.append(output_path)
 
-        try:
-            self.generate_merged_pdf(pdf_paths, output_path, questions)
-            QDesktopServices.openUrl(QUrl.fromLocalFile(output_path))
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate PDF:\n{e}")
+        self.start_pdf_merge(pdf_paths, output_path, questions, "preview")
 
     def save_paper(self):
         questions = self.collect_selected_questions()
@@ -650,47 +1074,63 @@ class ExamMakerUI(QWidget):
             return
 
         folder = self.component_box.currentText().replace(" ", "_")
-        base_path = os.path.dirname(__file__)
-        pdf_paths = [os.path.join(base_path, folder, q["index"] + ".pdf") for q in questions]
+        if self.missing_question_pdfs(folder, questions):
+            return
+        pdf_paths = [os.path.join(MODULE_DIR, folder, index + ".pdf") for index, _ in questions]
 
         save_path, _ = QFileDialog.getSaveFileName(self, "Save Paper As", "paper.pdf", "PDF Files (*.pdf)")
         if not save_path:
             return
 
-        try:
-            self.generate_merged_pdf(pdf_paths, save_path, questions)
-            QMessageBox.information(self, "Success", f"Paper saved to: {save_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save PDF:\n{e}")
-
-    def generate_merged_pdf(self, pdf_paths, output_path, questions):
-        doc = fitz.open()
-        show_indices = self.show_index_checkbox.isChecked()
+        self.start_pdf_merge(pdf_paths, save_path, questions, "save")
 
-        for i, (pdf_path, q) in enumerate(zip(pdf_paths, questions), start=1):
-            label = f"Question {i}"
-            if show_indices:
-                label += f": {q['index']}"
-
-            src = fitz.open(pdf_path)
-
-            for page_num in range(len(src)):
-                new_page = doc.new_page(width=595, height=842)
-
-                new_page.show_pdf_page(new_page.rect, src, pno=page_num)
-
-                new_page.insert_text(
-                    (50, 50),
-                    label,
-                    fontsize=12,
-                    fontname="Times-Roman",  # or "Courier"
-                    color=(0, 0, 0)
-                )
-
-            src.close()
+    def cached_merged_pdf(self, pdf_paths):
+        key = merge_cache_key(pdf_paths, self.show_index_checkbox.isChecked())
+        cached_path = self._merged_pdf_cache.get(key)
+        if cached_path and os.path.exists(cached_path):
+            return cached_path
+        return None
 
-        doc.save(output_path)
-        doc.close()
+    def start_pdf_merge(self, pdf_paths, output_path, questions, action):
+        """ Merge in the background so the window stays responsive; action is "preview" or "save" """
+        self._merge_action = action
+        self._merge_cache_key = merge_cache_key(pdf_paths, self.show_index_checkbox.isChecked())
+        self._merge_progress = QProgressDialog("Generating PDF...", "", 0, 0, self)
+        self._merge_progress.setWindowTitle("Please Wait")
+        self._merge_progress.setCancelButton(None)
+        self._merge_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self._merge_progress.setMinimumDuration(0)
+        self._merge_progress.show()
+
+        # Keep a reference so the signal bridge outlives the pool's copy of the worker
+        self._merge_worker = PdfMergeWorker(pdf_paths, output_path, questions,
+                                            self.show_index_checkbox.isChecked(),
+                                            fast=(action == "preview"))
+        self._merge_worker.signals.finished.connect(self.on_merge_finished)
+        self._merge_worker.signals.error.connect(self.on_merge_failed)
+        QThreadPool.globalInstance().start(self._merge_worker)
+
+    def on_merge_finished(self, output_path):
+        self._merge_progress.close()
+        self._merge_progress.deleteLater()  # close() only hides it; one would pile up per merge
+        self._merge_progress = None
+        self._merge_worker = None
+        if self._merge_action == "preview":
+            if self._merge_cache_key is not None:
+                self._merged_pdf_cache[self._merge_cache_key] = output_path
+            QDesktopServices.openUrl(QUrl.fromLocalFile(output_path))
+        else:
+            QMessageBox.information(self, "Success", f"Paper saved to: {output_path}")
+
+    def on_merge_failed(self, message):
+        self._merge_progress.close()
+        self._merge_progress.deleteLater()  # close() only hides it; one would pile up per merge
+        self._merge_progress = None
+        self._merge_worker = None
+        if self._merge_action == "preview":
+            QMessageBox.critical(self, "Error", f"Failed to generate PDF:\n{message}")
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to save PDF:\n{message}")
 
     def show_version_info(self):
         message = (
@@ -719,19 +1159,45 @@ class ExamMakerUI(QWidget):
         box.exec()
 
     def show_whats_new(self):
-        patch_dir = get_resource_path("patch_log")
-        entries = sorted([
-            f for f in os.listdir(patch_dir) if f.endswith(".txt")
-        ], reverse=True)
+        cache_age = time.monotonic() - self._patch_log_loaded_at
+        if self._patch_log_cache is not None and cache_age < PATCH_LOG_CACHE_SECONDS:
+            self.open_whats_new_dialog()
+            return
+        if self._patch_log_worker is not None:
+            return  # Still loading from a previous click
+
+        # Read the logs in the background so the first click doesn't stall the UI
+        self.whatsnew_btn.setEnabled(False)
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        self._patch_log_worker = PatchLogLoader(get_resource_path("patch_log"))
+        self._patch_log_worker.signals.finished.connect(self.on_patch_logs_loaded)
+        self._patch_log_worker.signals.error.connect(self.on_patch_logs_failed)
+        QThreadPool.globalInstance().start(self._patch_log_worker)
+
+    def on_patch_logs_loaded(self, patch_logs):
+        QApplication.restoreOverrideCursor()
+        self.whatsnew_btn.setEnabled(True)
+        self._patch_log_worker = None
+        self._patch_log_cache = patch_logs
+        self._patch_log_loaded_at = time.monotonic()
+        self.open_whats_new_dialog()
+
+    def on_patch_logs_failed(self, message):
+        QApplication.restoreOverrideCursor()
+        self.whatsnew_btn.setEnabled(True)
+        self._patch_log_worker = None
+        QMessageBox.warning(self, "What's New", f"Failed to read update logs:\n{message}")
+
+    def open_whats_new_dialog(self):
+        entries = self._patch_log_cache["entries"]
+        contents = self._patch_log_cache["contents"]
 
         if not entries:
             QMessageBox.information(self, "What's New", "No update logs found.")
             return
 
         latest_file = entries[0]
-        latest_path = os.path.join(patch_dir, latest_file)
-        with open(latest_path, "r") as f:
-            latest_content = f.read().strip()
+        latest_content = contents[latest_file].strip()
 
         # Create a custom dialog
         dialog = QDialog(self)
@@ -756,18 +1222,15 @@ class ExamMakerUI(QWidget):
         layout.addWidget(text_view)
 
         def load_selected_log():
-            date = combo.currentText()
-            path = os.path.join(patch_dir, f"{date}.txt")
-            if os.path.exists(path):
-                with open(path, "r") as f:
-                    text_view.setText(f.read())
+            file_name = f"{combo.currentText()}.txt"
+            if file_name in contents:
+                text_view.setText(contents[file_name])
 
         view_btn.clicked.connect(load_selected_log)
         dialog.setLayout(layout)
         dialog.resize(500, 400)
         dialog.exec()
 
-
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = ExamMakerUI()